@@ -0,0 +1,5 @@
+@echo off
+rem Starts GlobalTranslator.exe and, if it exits with an error, keeps the console
+rem window open so the error can be read. Place this file next to GlobalTranslator.exe.
+"%~dp0GlobalTranslator.exe" %*
+if errorlevel 1 pause
@@ -3,11 +3,24 @@ import os
 import sys
 from docx import Document
 from openai import OpenAI
+import io
 import re
-from typing import List, Tuple, Optional
+import codecs
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, List, Tuple, Optional
 from dotenv import load_dotenv
 from config import Config
 import fitz  # pymupdf
+import numpy as np
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Detect if running as standalone executable (prod mode)
 # PyInstaller creates a 'frozen' attribute when bundled as exe
@@ -75,6 +88,13 @@ SUPPORTED_LANGUAGES = [
     "Yiddish"
 ]
 
+# Marker placed between the paragraphs of a chunk so the translation can be split back reliably
+PARAGRAPH_SEPARATOR = "%%---%%"
+
+# Pre-compiled patterns used when splitting text into paragraphs and sentences
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
 # Page configuration
 st.set_page_config(
     page_title="Global Translator: AI Translation for Large Text Files",
@@ -82,6 +102,98 @@ st.set_page_config(
     layout="wide"
 )
 
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after ttl seconds.
+    Held with st.cache_resource so it is shared across reruns and sessions.
+    """
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(*parts: Optional[str]) -> str:
+        """Build a cache key from the given strings (None is treated as empty)."""
+        hasher = hashlib.sha256()
+        for part in parts:
+            hasher.update((part or "").encode("utf-8"))
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+    
+    def get(self, key: str):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value):
+        """Store value under key, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def get_translation_cache() -> TTLCache:
+    """
+    Get the process-wide cache of chunk translations.
+    """
+    return TTLCache(max_entries=Config.TRANSLATION_CACHE_MAX_ENTRIES, ttl=Config.TRANSLATION_CACHE_TTL)
+
+@st.cache_resource(show_spinner=False)
+def _make_openai_client(api_key: str) -> OpenAI:
+    """
+    Create one OpenAI client per API key and reuse it across reruns and sessions,
+    so its HTTP connection pool (and open TLS connections) survives widget interactions.
+    """
+    return OpenAI(api_key=api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_extraction_cache() -> TTLCache:
+    """
+    Get the process-wide cache of extracted documents, keyed on file contents.
+    """
+    return TTLCache(max_entries=Config.EXTRACTION_CACHE_MAX_ENTRIES, ttl=Config.EXTRACTION_CACHE_TTL)
+
+def get_token_encoding(model_name: str):
+    """
+    Get the tiktoken encoding used by model_name (o200k_base for unknown models).
+    Returns None if tiktoken is not installed or its vocabulary could not be loaded
+    (it is downloaded on first use; the executable bundles it).
+    tiktoken keeps loaded encodings for the life of the process, while a failed
+    load is not remembered, so it is retried for the next document.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+def count_tokens(text: str, encoding) -> int:
+    """
+    Count the model tokens in text, estimating from the word count
+    (Config.TOKENS_PER_WORD) when encoding is None.
+    """
+    if encoding is None:
+        return round(len(text.split()) * Config.TOKENS_PER_WORD)
+    # encode_ordinary: special-token markers in the document are just text here
+    return len(encoding.encode_ordinary(text))
+
 # Initialize OpenAI client
 def get_openai_client():
     """
@@ -102,7 +214,7 @@ def get_openai_client():
             st.error("Please set OPENAI_API_KEY in your .env file")
             st.stop()
     
-    return OpenAI(api_key=api_key)
+    return _make_openai_client(api_key)
 
 def extract_text_from_docx(file) -> List[Tuple[str, str]]:
     """
@@ -111,9 +223,17 @@ def extract_text_from_docx(file) -> List[Tuple[str, str]]:
     """
     doc = Document(file)
     paragraphs = []
+    # para.style resolves the style through the styles part on every access;
+    # documents reuse a handful of styles, so cache the name per style id
+    style_names = {}
     for para in doc.paragraphs:
-        if para.text.strip():  # Only include non-empty paragraphs
-            paragraphs.append((para.text, para.style.name))
+        text = para.text
+        if text and not text.isspace():  # Only include non-empty paragraphs
+            style_id = para._p.style
+            style_name = style_names.get(style_id)
+            if style_name is None:
+                style_name = style_names[style_id] = para.style.name
+            paragraphs.append((text, style_name))
     return paragraphs
 
 def extract_text_from_txt(file) -> List[Tuple[str, str]]:
@@ -124,42 +244,29 @@ def extract_text_from_txt(file) -> List[Tuple[str, str]]:
     # Read file content
     content = file.read()
     
-    # Try to decode with UTF-8, fallback to other encodings
+    # Sniff the byte order mark first, then try UTF-8 and fall back to latin-1
+    # (which accepts any byte sequence), so the buffer is decoded at most twice
     if isinstance(content, bytes):
-        try:
-            text = content.decode('utf-8')
-        except UnicodeDecodeError:
+        if content.startswith(codecs.BOM_UTF8):
+            text = content.decode('utf-8-sig', errors='replace')
+        elif content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            text = content.decode('utf-16', errors='replace')
+        else:
             try:
-                text = content.decode('latin-1')
+                text = content.decode('utf-8')
             except UnicodeDecodeError:
-                text = content.decode('utf-8', errors='ignore')
+                text = content.decode('latin-1')
     else:
         text = content
     
-    # Split into paragraphs (double newline or single newline for empty lines)
+    # Split into paragraphs at blank (or whitespace-only) lines. Any text that is not
+    # all whitespace yields at least one paragraph here, so no second pass is needed
     paragraphs = []
-    para_texts = re.split(r'\n\s*\n', text)
-    
-    for para_text in para_texts:
+    for para_text in _PARA_SPLIT_RE.split(text):
         para_text = para_text.strip()
         if para_text:  # Only include non-empty paragraphs
             paragraphs.append((para_text, 'Normal'))
     
-    # If no double newlines found, split by single newlines
-    if not paragraphs:
-        lines = text.split('\n')
-        current_para = []
-        for line in lines:
-            line = line.strip()
-            if line:
-                current_para.append(line)
-            else:
-                if current_para:
-                    paragraphs.append((' '.join(current_para), 'Normal'))
-                    current_para = []
-        if current_para:
-            paragraphs.append((' '.join(current_para), 'Normal'))
-    
     return paragraphs
 
 def detect_scanned_pdf(extracted_text: str) -> bool:
@@ -178,39 +285,104 @@ def detect_multi_column_issue(text: str, page_count: int) -> bool:
     Detect potential multi-column layout issues in PDF.
     Returns True if multi-column layout is suspected.
     """
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    if not lines:
+    # Both heuristics only apply to multi-page documents
+    if page_count <= 1:
         return False
     
-    avg_line_length = sum(len(line) for line in lines) / len(lines)
+    # Lengths of the non-empty (stripped) lines, gathered in a single pass
+    line_lengths = np.fromiter((len(line) for line in map(str.strip, text.split('\n')) if line), dtype=np.int32)
+    if line_lengths.size == 0:
+        return False
+    
+    avg_line_length = line_lengths.mean()
     
     # Heuristic: short average line length + multiple pages = possible multi-column
-    if avg_line_length < 50 and page_count > 1:
+    if avg_line_length < 50:
         return True
     
     # Additional check: if many lines are very short, likely multi-column
-    short_lines = sum(1 for line in lines if len(line) < 40)
-    if short_lines > len(lines) * 0.6 and page_count > 1:
+    short_lines = int((line_lengths < 40).sum())
+    if short_lines > line_lengths.size * 0.6:
         return True
     
     return False
 
+# Text extraction flags: pymupdf's plain-text defaults (no TEXT_PRESERVE_IMAGES, so image
+# blocks are never collected) plus dehyphenation, so words broken across lines reach
+# the translator whole
+PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE
+
 def extract_text_from_pdf_simple(page) -> str:
     """
     Simple text extraction from PDF page using pymupdf.
     Extracts text only (images are automatically excluded).
     """
     try:
-        return page.get_text()
+        return page.get_text("text", flags=PDF_TEXT_FLAGS)
     except:
         return ""
 
-def extract_text_from_pdf(file) -> Tuple[List[Tuple[str, str]], dict]:
+def iter_pdf_page_texts(doc) -> Iterator[str]:
+    """
+    Yield the text of each page of an open PDF in order; closes doc when done.
+    """
+    try:
+        for page_num in range(len(doc)):
+            yield extract_text_from_pdf_simple(doc[page_num])
+    finally:
+        doc.close()
+
+def _pdf_error(e: Exception) -> ValueError:
+    """
+    Translate a pymupdf failure into a user-facing error.
+    """
+    error_msg = str(e).lower()
+    if "password" in error_msg or "encrypted" in error_msg:
+        return ValueError("PDF is password-protected. Please unlock the PDF first.")
+    elif "invalid" in error_msg or "corrupted" in error_msg:
+        return ValueError("PDF appears to be corrupted or invalid. Please check the file.")
+    else:
+        return ValueError(f"Error reading PDF: {str(e)}")
+
+def iter_pdf_paragraphs(doc, metadata: dict) -> Iterator[Tuple[str, str]]:
+    """
+    Yield PDF paragraphs page by page, so translation can start before extraction finishes.
+    Fills in metadata['scanned'] and metadata['multi_column'] once all pages have been read.
+    """
+    try:
+        page_texts: List[str] = []
+        for page_text in iter_pdf_page_texts(doc):
+            if not page_text:
+                continue
+            page_texts.append(page_text)
+            
+            # Pages are separated by paragraph breaks, so splitting page by page
+            # gives the same paragraphs as splitting the whole text
+            for para_text in _PARA_SPLIT_RE.split(page_text):
+                para_text = para_text.strip()
+                if para_text:
+                    yield (para_text, 'Normal')
+        
+        full_text = "\n\n".join(page_texts)
+    except Exception as e:
+        metadata['error'] = str(e)
+        raise _pdf_error(e)
+    
+    # Check for scanned PDF
+    if detect_scanned_pdf(full_text):
+        metadata['scanned'] = True
+    
+    # Check for multi-column issue (heuristic check)
+    if detect_multi_column_issue(full_text, metadata['page_count']):
+        metadata['multi_column'] = True
+
+def extract_text_from_pdf(file) -> Tuple[Iterator[Tuple[str, str]], dict]:
     """
     Extract text from PDF document using pymupdf, preserving paragraph structure.
     Returns tuple: (paragraphs, metadata)
-    paragraphs: list of tuples (paragraph_text, paragraph_style)
-    metadata: dict with warnings and info (scanned, multi_column, page_count)
+    paragraphs: lazy iterator of tuples (paragraph_text, paragraph_style)
+    metadata: dict with warnings and info (scanned, multi_column, page_count);
+    scanned and multi_column are only set once paragraphs has been fully consumed
     """
     metadata = {
         'scanned': False,
@@ -221,12 +393,12 @@ def extract_text_from_pdf(file) -> Tuple[List[Tuple[str, str]], dict]:
     }
     
     try:
-        # Read file content
-        file_content = file.read()
-        file.seek(0)  # Reset file pointer
+        # Streamlit uploads are in-memory BytesIO objects: getvalue() shares their bytes
+        # (getbuffer() would force a private copy) and leaves the file position alone
+        pdf_buffer = file.getvalue() if hasattr(file, 'getvalue') else file.read()
         
         # Open PDF
-        doc = fitz.open(stream=file_content, filetype="pdf")
+        doc = fitz.open(stream=pdf_buffer, filetype="pdf")
         metadata['page_count'] = len(doc)
         
         # Check if encrypted
@@ -234,51 +406,19 @@ def extract_text_from_pdf(file) -> Tuple[List[Tuple[str, str]], dict]:
             metadata['encrypted'] = True
             doc.close()
             raise ValueError("PDF is password-protected. Please unlock the PDF first.")
-        
-        # Extract text page by page
-        full_text = ""
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_text = extract_text_from_pdf_simple(page)
-            if page_text:
-                full_text += page_text + "\n\n"
-        
-        doc.close()
-        
-        # Check for scanned PDF
-        if detect_scanned_pdf(full_text):
-            metadata['scanned'] = True
-        
-        # Check for multi-column issue (heuristic check)
-        if detect_multi_column_issue(full_text, metadata['page_count']):
-            metadata['multi_column'] = True
-        
-        # Split into paragraphs
-        paragraphs = []
-        if full_text.strip():
-            para_texts = re.split(r'\n\s*\n', full_text)
-            for para_text in para_texts:
-                para_text = para_text.strip()
-                if para_text:
-                    paragraphs.append((para_text, 'Normal'))
-        
-        return paragraphs, metadata
-        
     except Exception as e:
         metadata['error'] = str(e)
-        error_msg = str(e).lower()
-        if "password" in error_msg or "encrypted" in error_msg:
-            raise ValueError("PDF is password-protected. Please unlock the PDF first.")
-        elif "invalid" in error_msg or "corrupted" in error_msg:
-            raise ValueError("PDF appears to be corrupted or invalid. Please check the file.")
-        else:
-            raise ValueError(f"Error reading PDF: {str(e)}")
+        raise _pdf_error(e)
+    
+    # Pages are extracted lazily as the paragraphs are consumed
+    return iter_pdf_paragraphs(doc, metadata), metadata
 
-def extract_text_from_file(file, file_type: str) -> Tuple[List[Tuple[str, str]], Optional[dict]]:
+def extract_text_from_file(file, file_type: str) -> Tuple[Iterable[Tuple[str, str]], Optional[dict]]:
     """
     Unified function to extract text from different file types.
     Returns tuple: (paragraphs, metadata)
     metadata is None for non-PDF files, dict for PDF files
+    PDF paragraphs are a lazy iterator (see extract_text_from_pdf)
     """
     file.seek(0)  # Reset file pointer
     
@@ -291,107 +431,221 @@ def extract_text_from_file(file, file_type: str) -> Tuple[List[Tuple[str, str]],
     else:
         raise ValueError(f"Unsupported file type: {file_type}")
 
-def split_paragraphs_into_chunks(paragraphs: List[Tuple[str, str]], max_words: int = 3500) -> List[Tuple[List[Tuple[str, str]], int]]:
+def _record_paragraphs(paragraphs: Iterable[Tuple[str, str]], metadata: Optional[dict],
+                       cache: TTLCache, key: str) -> Iterator[Tuple[str, str]]:
+    """
+    Pass paragraphs through, storing them in cache once the document has been fully extracted.
+    """
+    recorded = []
+    for paragraph in paragraphs:
+        recorded.append(paragraph)
+        yield paragraph
+    cache.set(key, (recorded, metadata))
+
+def extract_text_from_file_cached(file, file_type: str, cache: TTLCache) -> Tuple[Iterable[Tuple[str, str]], Optional[dict]]:
+    """
+    extract_text_from_file memoized on the file contents, so translating the same
+    upload again (e.g. into another language) skips extraction entirely.
+    """
+    key = TTLCache.make_key(hashlib.blake2b(file.getvalue()).hexdigest(), file_type)
+    
+    cached = cache.get(key)
+    if cached is not None:
+        paragraphs, metadata = cached
+        return paragraphs, metadata
+    
+    paragraphs, metadata = extract_text_from_file(file, file_type)
+    return _record_paragraphs(paragraphs, metadata, cache, key), metadata
+
+def split_paragraphs_into_chunks(paragraphs: Iterable[Tuple[str, str]],
+                                 max_tokens: int = round(Config.DEFAULT_CHUNK_SIZE * Config.TOKENS_PER_WORD),
+                                 max_paras: int = Config.BATCH_MAX_PARAS,
+                                 max_chars: int = Config.BATCH_MAX_CHARS) -> Iterator[Tuple[List[Tuple[str, str]], int]]:
     """
     Split paragraphs into chunks that respect sentence and paragraph boundaries.
     Never splits sentences or paragraphs.
-    Returns list of tuples: (chunk_paragraphs, chunk_start_index)
+    Chunk size is measured in model tokens, so scripts without spaces between
+    words (Chinese, Japanese, Thai, ...) are sized as accurately as English.
+    Each chunk is sent as one batched request, so it is also capped at max_paras
+    paragraphs and max_chars characters.
+    Yields tuples: (chunk_paragraphs, chunk_start_index), so callers can start
+    working on a chunk before the rest of the document has been chunked.
     """
-    chunks = []
+    # Resolved once per document: paragraphs are counted one at a time
+    encoding = get_token_encoding(Config.MODEL_NAME)
     current_chunk = []
-    current_word_count = 0
+    current_token_count = 0
+    current_char_count = 0
     chunk_start_idx = 0
     
     for idx, (para_text, para_style) in enumerate(paragraphs):
-        para_words = len(para_text.split())
+        para_tokens = count_tokens(para_text, encoding)
         
-        # If a single paragraph exceeds max_words, split by sentences
-        if para_words > max_words:
+        # If a single paragraph exceeds max_tokens, split by sentences
+        if para_tokens > max_tokens:
             # Save current chunk if it has content
             if current_chunk:
-                chunks.append((current_chunk, chunk_start_idx))
+                yield (current_chunk, chunk_start_idx)
                 current_chunk = []
-                current_word_count = 0
+                current_token_count = 0
+                current_char_count = 0
                 chunk_start_idx = idx
             
-            # Split paragraph by sentences
-            sentences = re.split(r'(?<=[.!?])\s+', para_text)
-            sentence_chunk = []
-            sentence_word_count = 0
-            sentence_start_idx = idx
+            # Split paragraph by sentences, then walk a window of whole sentences
+            # over it, joining each window once when it is emitted
+            sentences = _SENT_SPLIT_RE.split(para_text)
+            # Windows are joined with spaces, so count each sentence with the space in
+            # front of it: tokens merge across that space the same way in the joined text
+            sentence_token_counts = [count_tokens(' ' + sentence, encoding) for sentence in sentences]
+            window_start = 0
+            window_token_count = 0
             
-            for sentence in sentences:
-                sentence_words = len(sentence.split())
-                
-                if sentence_word_count + sentence_words > max_words and sentence_chunk:
+            for i, sentence_tokens in enumerate(sentence_token_counts):
+                if window_token_count + sentence_tokens > max_tokens and i > window_start:
                     # Save sentence chunk as a special paragraph
-                    chunks.append(([(' '.join(sentence_chunk), para_style)], sentence_start_idx))
-                    sentence_chunk = [sentence]
-                    sentence_word_count = sentence_words
-                    sentence_start_idx = idx
-                else:
-                    sentence_chunk.append(sentence)
-                    sentence_word_count += sentence_words
+                    yield ([(' '.join(sentences[window_start:i]), para_style)], idx)
+                    window_start = i
+                    window_token_count = 0
+                window_token_count += sentence_tokens
             
-            if sentence_chunk:
-                current_chunk.append((' '.join(sentence_chunk), para_style))
-                current_word_count = sentence_word_count
-                if not current_chunk or len(current_chunk) == 1:
-                    chunk_start_idx = sentence_start_idx
+            # The remaining sentences start the next chunk
+            current_chunk = [(' '.join(sentences[window_start:]), para_style)]
+            current_token_count = window_token_count
+            current_char_count = len(current_chunk[0][0])
+            chunk_start_idx = idx
         else:
-            # Check if adding this paragraph would exceed max_words
-            if current_word_count + para_words > max_words and current_chunk:
-                chunks.append((current_chunk, chunk_start_idx))
+            # Check if adding this paragraph would exceed max_tokens or the batch limits
+            exceeds_batch = (current_token_count + para_tokens > max_tokens
+                             or len(current_chunk) >= max_paras
+                             or current_char_count + len(para_text) > max_chars)
+            if exceeds_batch and current_chunk:
+                yield (current_chunk, chunk_start_idx)
                 current_chunk = [(para_text, para_style)]
-                current_word_count = para_words
+                current_token_count = para_tokens
+                current_char_count = len(para_text)
                 chunk_start_idx = idx
             else:
                 current_chunk.append((para_text, para_style))
-                current_word_count += para_words
+                current_token_count += para_tokens
+                current_char_count += len(para_text)
                 if len(current_chunk) == 1:
                     chunk_start_idx = idx
     
     # Add remaining chunk
     if current_chunk:
-        chunks.append((current_chunk, chunk_start_idx))
-    
-    return chunks
+        yield (current_chunk, chunk_start_idx)
 
-def translate_text(client: OpenAI, text: str, target_language: str = None, source_language: str = None, translation_hints: str = None) -> str:
+def build_system_prompt(target_language: str = None, source_language: str = None, translation_hints: str = None) -> str:
     """
-    Translate text using OpenAI API.
+    Build the system prompt for a translation request.
+    Everything that stays the same across a document's chunks lives here, so the
+    chunk text is the only part of the request that varies (lets OpenAI reuse its
+    cached prompt prefix across chunks).
     """
-    system_prompt = "You are a professional translator. Translate the following text accurately while preserving the original formatting, style, and meaning. Maintain paragraph breaks and sentence structure."
+    system_prompt = "You are a professional translator. Translate the text provided by the user accurately while preserving the original formatting, style, and meaning. Maintain paragraph breaks and sentence structure."
+    system_prompt += f" Paragraphs are separated by the marker {PARAGRAPH_SEPARATOR}. Preserve every {PARAGRAPH_SEPARATOR} marker exactly as-is between the translated paragraphs; do not translate it."
     
-    user_prompt = text
     if source_language and target_language:
-        user_prompt = f"Translate the following text from {source_language} to {target_language}:\n\n{text}"
+        system_prompt += f"\n\nTranslate from {source_language} to {target_language}."
     elif target_language:
-        user_prompt = f"Translate the following text to {target_language}:\n\n{text}"
+        system_prompt += f"\n\nTranslate to {target_language}."
     elif source_language:
-        user_prompt = f"The following text is in {source_language}. Translate it:\n\n{text}"
+        system_prompt += f"\n\nThe text is in {source_language}."
     
     # Add translation hints if provided
     if translation_hints and translation_hints.strip():
         system_prompt += f"\n\nAdditional translation instructions: {translation_hints}"
     
-    try:
-        response = client.chat.completions.create(
-            model=Config.MODEL_NAME,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        st.error(f"Translation error: {str(e)}")
-        return None
+    return system_prompt
+
+def translate_text(client: OpenAI, text: str, target_language: str = None, source_language: str = None, translation_hints: str = None) -> str:
+    """
+    Translate text using OpenAI API.
+    Raises on API errors so callers running it on worker threads can report them.
+    """
+    system_prompt = build_system_prompt(target_language, source_language, translation_hints)
+    
+    response = client.chat.completions.create(
+        model=Config.MODEL_NAME,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text}
+        ],
+        temperature=0.3,
+        # Route requests sharing this prompt prefix to the same prompt cache
+        prompt_cache_key=hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:32]
+    )
+    return response.choices[0].message.content
 
-def create_docx_from_paragraphs(paragraphs: List[Tuple[str, str]], output_path: str):
+def translate_chunks(client: OpenAI, chunk_texts: Iterable[str], target_language: str = None, source_language: str = None,
+                     translation_hints: str = None, progress_callback: Callable[[int, int], None] = None,
+                     cache: Optional[TTLCache] = None) -> List[Optional[str]]:
+    """
+    Translate chunks concurrently, bounded by Config.MAX_CONCURRENT_REQUESTS.
+    chunk_texts may be a lazy iterable: each chunk is dispatched as soon as it is produced,
+    so translation overlaps with extracting and chunking the rest of the document.
+    Chunks already in cache are reused without calling the API.
+    Returns translations in the same order as chunk_texts.
+    progress_callback(completed, total) is called from the calling thread as chunks finish.
+    """
+    translations: List[Optional[str]] = []
+    cache_keys: List[str] = []
+    futures = {}
+    
+    with ThreadPoolExecutor(max_workers=Config.MAX_CONCURRENT_REQUESTS) as executor:
+        try:
+            for i, chunk_text in enumerate(chunk_texts):
+                translations.append(None)
+                
+                # Serve repeated chunks (re-runs, retries) from the cache
+                if cache is not None:
+                    cache_keys.append(TTLCache.make_key(chunk_text, target_language, source_language, translation_hints, Config.MODEL_NAME))
+                    translations[i] = cache.get(cache_keys[i])
+                    if translations[i] is not None:
+                        continue
+                
+                future = executor.submit(translate_text, client, chunk_text, target_language, source_language, translation_hints)
+                futures[future] = i
+            
+            total = len(translations)
+            completed = total - len(futures)
+            if completed and progress_callback:
+                progress_callback(completed, total)
+            
+            for future in as_completed(futures):
+                # Index by chunk position so output order matches input order
+                i = futures[future]
+                translations[i] = future.result()
+                if cache is not None and translations[i] is not None:
+                    cache.set(cache_keys[i], translations[i])
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total)
+        except Exception:
+            # Don't keep paying for the remaining chunks once one has failed
+            for future in futures:
+                future.cancel()
+            raise
+    
+    return translations
+
+def split_translated_chunk(translated_text: str, expected_count: int) -> List[str]:
+    """
+    Split a translated chunk back into paragraphs on PARAGRAPH_SEPARATOR.
+    Falls back to splitting on blank lines if the model dropped or added markers.
+    """
+    para_texts = [para.strip() for para in translated_text.split(PARAGRAPH_SEPARATOR)]
+    if len(para_texts) == expected_count:
+        return para_texts
+    
+    # Marker count mismatch: strip any leftover markers and split on paragraph breaks instead
+    cleaned_text = translated_text.replace(PARAGRAPH_SEPARATOR, '\n\n')
+    return [para.strip() for para in _PARA_SPLIT_RE.split(cleaned_text) if para.strip()]
+
+def create_docx_from_paragraphs(paragraphs: List[Tuple[str, str]]) -> bytes:
     """
     Create a Word document from paragraphs with their original styles.
+    Returns the .docx file contents, built in memory.
     """
     doc = Document()
     for text, style_name in paragraphs:
@@ -401,7 +655,9 @@ def create_docx_from_paragraphs(paragraphs: List[Tuple[str, str]], output_path:
         except:
             # If style doesn't exist, use default
             para.style = doc.styles['Normal']
-    doc.save(output_path)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
 
 def main():
     st.title("🌍 Global Translator: AI Translation for Large Text Files")
@@ -582,15 +838,55 @@ def main():
         if st.button("Translate Document", type="primary"):
             with st.spinner("Processing document..."):
                 try:
-                    # Extract text from document
-                    paragraphs, metadata = extract_text_from_file(uploaded_file, file_type)
+                    # Extract text from document (PDF pages are extracted lazily, as chunks are needed)
+                    paragraphs, metadata = extract_text_from_file_cached(uploaded_file, file_type, get_extraction_cache())
+                    
+                    if metadata and metadata.get('encrypted'):
+                        st.error("❌ This PDF is password-protected. Please unlock it first.")
+                        return
+                    
+                    client = get_openai_client()
+                    translated_paragraphs = []
+                    
+                    progress_bar = st.progress(0)
+                    status_text = st.empty()
+                    status_text.text("Extracting and translating document...")
+                    
+                    # Split paragraphs into chunks (preserving structure); each chunk is
+                    # handed to the translators as soon as it is complete
+                    chunk_data = []
+                    extraction_errors = []
+                    separator = f"\n\n{PARAGRAPH_SEPARATOR}\n\n"
+                    # The chunk size setting is in words; chunks are measured in tokens
+                    max_tokens = round(chunk_size * Config.TOKENS_PER_WORD)
                     
-                    # Show PDF-specific warnings
+                    def iter_chunk_texts():
+                        try:
+                            for chunk_paragraphs, start_idx in split_paragraphs_into_chunks(paragraphs, max_tokens=max_tokens):
+                                chunk_data.append((chunk_paragraphs, start_idx))
+                                # Combine chunk paragraphs into text for translation
+                                yield separator.join([para[0] for para in chunk_paragraphs])
+                        except Exception as e:
+                            extraction_errors.append(e)
+                            raise
+                    
+                    def update_progress(completed: int, total: int):
+                        status_text.text(f"Translated chunk {completed}/{total}...")
+                        progress_bar.progress(completed / total)
+                    
+                    # Translate all chunks concurrently
+                    try:
+                        translated_chunks = translate_chunks(client, iter_chunk_texts(), target_language, source_language_value,
+                                                             translation_hints, progress_callback=update_progress,
+                                                             cache=get_translation_cache())
+                    except Exception as e:
+                        if extraction_errors:
+                            raise
+                        st.error(f"Translation error: {str(e)}")
+                        translated_chunks = None
+                    
+                    # Show PDF-specific warnings (known once all pages have been read)
                     if metadata:
-                        if metadata.get('encrypted'):
-                            st.error("❌ This PDF is password-protected. Please unlock it first.")
-                            return
-                        
                         if metadata.get('scanned'):
                             st.warning("⚠️ **Scanned PDF Detected:** This PDF appears to be image-based (scanned). "
                                      "Text extraction may be limited. Text-based PDFs work best. "
@@ -602,40 +898,24 @@ def main():
                                      "then all right column text, instead of reading left-to-right across columns). "
                                      "For best results, use single-column PDFs or manually verify the translation output.")
                     
-                    if not paragraphs:
+                    if translated_chunks is not None and not chunk_data:
+                        status_text.empty()
+                        progress_bar.empty()
                         st.warning("The document appears to be empty or no text could be extracted.")
                         if metadata and metadata.get('scanned'):
                             st.info("💡 Tip: If this is a scanned PDF, you may need OCR software to extract text first.")
                         return
                     
-                    # Split paragraphs into chunks (preserving structure)
-                    chunk_data = split_paragraphs_into_chunks(paragraphs, max_words=chunk_size)
+                    if translated_chunks is None or any(text is None for text in translated_chunks):
+                        st.error("Translation failed. Please check your API key and try again.")
+                        return
                     
                     st.info(f"Document split into {len(chunk_data)} chunk(s) for translation.")
                     
-                    # Translate chunks
-                    client = get_openai_client()
-                    translated_paragraphs = []
-                    
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    
-                    for i, (chunk_paragraphs, start_idx) in enumerate(chunk_data):
-                        status_text.text(f"Translating chunk {i+1}/{len(chunk_data)}...")
-                        
-                        # Combine chunk paragraphs into text for translation
-                        chunk_text = '\n\n'.join([para[0] for para in chunk_paragraphs])
-                        
-                        # Translate the chunk
-                        translated_text = translate_text(client, chunk_text, target_language, source_language_value, translation_hints)
-                        
-                        if translated_text is None:
-                            st.error("Translation failed. Please check your API key and try again.")
-                            return
-                        
+                    for (chunk_paragraphs, start_idx), translated_text in zip(chunk_data, translated_chunks):
                         # Split translated text back into paragraphs
-                        # The translation should preserve paragraph breaks
-                        translated_para_texts = translated_text.split('\n\n')
+                        # The translation should preserve the paragraph markers
+                        translated_para_texts = split_translated_chunk(translated_text, len(chunk_paragraphs))
                         
                         # Map translated paragraphs back to original styles
                         for j, translated_para_text in enumerate(translated_para_texts):
@@ -646,9 +926,7 @@ def main():
                                 # If we got more paragraphs than expected, use the last style
                                 original_style = chunk_paragraphs[-1][1] if chunk_paragraphs else 'Normal'
                             
-                            translated_paragraphs.append((translated_para_text.strip(), original_style))
-                        
-                        progress_bar.progress((i + 1) / len(chunk_data))
+                            translated_paragraphs.append((translated_para_text, original_style))
                     
                     # Create output document
                     output_paragraphs = translated_paragraphs
@@ -659,21 +937,16 @@ def main():
                     base_name = os.path.splitext(original_name)[0]
                     output_filename = f"translated_{base_name}.docx"
                     
-                    create_docx_from_paragraphs(output_paragraphs, output_filename)
+                    output_data = create_docx_from_paragraphs(output_paragraphs)
                     
                     # Provide download button
-                    with open(output_filename, "rb") as file:
-                        st.success("Translation complete!")
-                        st.download_button(
-                            label="Download Translated Document",
-                            data=file.read(),
-                            file_name=output_filename,
-                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        )
-                    
-                    # Clean up
-                    if os.path.exists(output_filename):
-                        os.remove(output_filename)
+                    st.success("Translation complete!")
+                    st.download_button(
+                        label="Download Translated Document",
+                        data=output_data,
+                        file_name=output_filename,
+                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                    )
                     
                     status_text.empty()
                     progress_bar.empty()
@@ -27,8 +27,19 @@ datas += safe_copy_metadata('packaging')
 datas += safe_copy_metadata('filelock')
 datas += safe_copy_metadata('numpy')
 
-# Add application files
-datas += [('app.py', '.'), ('config.py', '.')]
+# Add application files. app.py is run by Streamlit from source; the modules it
+# imports are bundled as compiled hidden imports below, so they are not recompiled
+# from the freshly extracted folder on every launch
+datas += [('app.py', '.')]
+
+# Bundle tiktoken's o200k_base vocabulary, which app.py measures chunks with.
+# tiktoken would otherwise download it on first use, with no timeout; loading it
+# here fills a cache folder that the launcher points TIKTOKEN_CACHE_DIR at in the exe
+tiktoken_cache_dir = os.path.join(workpath, 'tiktoken_cache')
+os.environ['TIKTOKEN_CACHE_DIR'] = tiktoken_cache_dir
+import tiktoken
+tiktoken.get_encoding('o200k_base')
+datas += [(tiktoken_cache_dir, 'tiktoken_cache')]
 
 # Collect all streamlit submodules to be safe
 hiddenimports = collect_submodules('streamlit')
@@ -39,6 +50,10 @@ hiddenimports += [
     'docx',
     'dotenv',
     'openai',
+    'tiktoken',
+    'tiktoken_ext.openai_public',  # encodings are registered via this plugin module
+    # Application modules imported by app.py
+    'config',
 ]
 
 # Add Anaconda Library/bin to pathex to find DLLs
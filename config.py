@@ -16,9 +16,29 @@ class Config:
     # Chunking Settings
     MIN_CHUNK_SIZE = 3000
     MAX_CHUNK_SIZE = 4000
+    # Chunks are measured in model tokens; the chunk size setting is in (English) words
+    TOKENS_PER_WORD = 1.3
+    # Paragraphs in a chunk are batched into one request. The paragraph cap is a
+    # backstop for pathological input (e.g. lists of single words or numbers, where
+    # the separators would outweigh the text); at the default chunk size it only
+    # binds when paragraphs average under ~3.5 words
+    BATCH_MAX_PARAS = 1000
+    BATCH_MAX_CHARS = 40000
+    
+    # Translation Cache Settings
+    # Identical chunks (same text, languages, instructions and model) are reused
+    TRANSLATION_CACHE_MAX_ENTRIES = 1024
+    TRANSLATION_CACHE_TTL = 24 * 3600  # seconds
+    
+    # Extraction Cache Settings
+    # Recently uploaded documents are only extracted once
+    EXTRACTION_CACHE_MAX_ENTRIES = 8
+    EXTRACTION_CACHE_TTL = 3600  # seconds
     
     # API Settings
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    # Upper bound on concurrent translation requests (keeps us under RPM limits)
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
     
     # Application Settings
     APP_TITLE = "Global Translator"
@@ -1,52 +1,93 @@
 import sys
 import os
-import traceback
 
-# Global exception handler to keep window open
-def show_error_and_wait(type, value, tb):
-    print("\n" + "="*60)
-    print("CRITICAL ERROR OCCURRED")
-    print("="*60)
-    traceback.print_exception(type, value, tb)
-    print("="*60)
-    input("Press Enter to exit...")
+# Streamlit config options, as "streamlit run" would receive them as flags.
+# These are the launcher's defaults; STREAMLIT_* environment variables override them
+STREAMLIT_FLAG_OPTIONS = {
+    "server.headless": True,
+    "server.port": 8501,
+    "server.address": "localhost",
+    "browser.gatherUsageStats": False,
+    "global.developmentMode": False,
+}
 
-sys.excepthook = show_error_and_wait
+# Environment variable values accepted for boolean options (the same as Click's)
+BOOL_ENV_VALUES = {
+    "1": True, "true": True, "t": True, "yes": True, "y": True, "on": True,
+    "0": False, "false": False, "f": False, "no": False, "n": False, "off": False,
+}
 
-try:
-    from streamlit.web import cli as stcli
-except ImportError as e:
-    print(f"Failed to import Streamlit: {e}")
-    input("Press Enter to exit...")
-    sys.exit(1)
+# Get the directory holding app.py: the folder PyInstaller extracts the bundle to
+# (_MEIPASS) when running as the executable, otherwise this script's own folder
+# (__file__ of the main script is already absolute on Python 3.9+)
+base_path = getattr(sys, '_MEIPASS', None) or os.path.dirname(__file__)
+app_path = os.path.join(base_path, 'app.py')
 
-# Get the directory where the executable is located
-if getattr(sys, 'frozen', False):
-    # Running as compiled executable
-    # PyInstaller sets _MEIPASS to the temp folder where files are extracted
-    base_path = sys._MEIPASS
-    app_path = os.path.join(base_path, 'app.py')
-    # Ensure we're in the right directory
-    os.chdir(base_path)
-else:
-    # Running as script
-    base_path = os.path.dirname(os.path.abspath(__file__))
-    app_path = os.path.join(base_path, 'app.py')
+# The executable bundles tiktoken's vocabulary (see build_exe.spec), so token
+# counting never has to download it; an explicit TIKTOKEN_CACHE_DIR still wins
+if getattr(sys, '_MEIPASS', None):
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", os.path.join(base_path, "tiktoken_cache"))
+
+def _get_flag_options(config_options):
+    """
+    Build Streamlit's flag options: the launcher defaults in STREAMLIT_FLAG_OPTIONS,
+    overridden by the STREAMLIT_* environment variable of any config option.
+    config_options is Streamlit's option template (option name -> ConfigOption).
+    "streamlit run" reads these variables through Click; without the CLI,
+    Streamlit itself only reads them for sensitive options, which are skipped here.
+    Exits with a message naming the variable if a value cannot be used.
+    """
+    flag_options = dict(STREAMLIT_FLAG_OPTIONS)
+    for name, option in config_options.items():
+        if option.sensitive or not option.env_var:
+            continue
+        # Like Click, treat an empty variable as unset
+        value = os.environ.get(option.env_var)
+        if not value:
+            continue
+        try:
+            if option.multiple:
+                flag_options[name] = value.split()
+            elif option.type is bool:
+                flag_options[name] = BOOL_ENV_VALUES[value.strip().lower()]
+            else:
+                flag_options[name] = option.type(value)
+        except (KeyError, ValueError):
+            expected = {bool: "true or false", int: "an integer", float: "a number"}.get(option.type, "a valid value")
+            print(f"Invalid value for {option.env_var}: {value!r} (expected {expected})")
+            sys.exit(1)
+    return flag_options
+
+def _run_streamlit(app_path):
+    """
+    Run the Streamlit server for app_path until it shuts down.
+    Does what "streamlit run" does after parsing its command line, so the CLI
+    and Click are never loaded; STREAMLIT_* environment variables still apply
+    (see _get_flag_options). The options are passed as flag options rather
+    than set with set_option: loading the config files re-parses every option,
+    and the file watchers re-apply flag_options whenever a config file changes.
+    Streamlit runs in this process on purpose: in the exe, sys.executable is
+    the launcher itself, so there is no separate interpreter to exec into.
+    """
+    # Streamlit is imported last, so nothing before this waits on its import tree
+    try:
+        from streamlit import config as _config
+        from streamlit.web import bootstrap
+    except ImportError as e:
+        print(f"Failed to import Streamlit: {e}")
+        sys.exit(1)
+    
+    flag_options = _get_flag_options(_config._config_options_template)
+    _config._main_script_path = app_path
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(app_path, False, [], flag_options)
 
 # Run Streamlit
 if __name__ == '__main__':
-    # Prepare arguments for Streamlit
-    sys.argv = [
-        "streamlit",
-        "run",
-        app_path,
-        "--server.headless", "true",
-        "--server.port", "8501",
-        "--server.address", "localhost",
-        "--browser.gatherUsageStats", "false",
-        "--global.developmentMode", "false",
-    ]
+    _run_streamlit(app_path)
     
-    # Run Streamlit directly
-    sys.exit(stcli.main())
-
+    # The server has shut down (e.g. Ctrl+C). Exit straight away instead of going
+    # through interpreter teardown, which waits on any leftover worker threads
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)